@@ -1,6 +1,13 @@
 """Claude Sandbox - Launch Claude Code in a sandboxed Docker container."""
 
-from claude_sandbox.cli import main, run_sandbox
-
 __all__ = ["main", "run_sandbox"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # Resolve the CLI lazily so importing the package doesn't pull in click.
+    if name in __all__:
+        from claude_sandbox import cli
+
+        return getattr(cli, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
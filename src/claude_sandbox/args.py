@@ -1,16 +1,16 @@
 """CLI argument parsing for claude-sandbox."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Args:
     """Parsed command-line arguments."""
 
     profile: str = "default"
     enable_github: bool = False
     detach_mode: bool = False
-    host_ports: list[int] = field(default_factory=list)
+    host_ports: tuple[int, ...] = ()
 
     @property
     def volume_name(self) -> str:
@@ -1,49 +1,95 @@
 """CLI entry point for claude-sandbox."""
 
 import os
-import subprocess
 import sys
-from pathlib import Path
+from collections.abc import Mapping
+from functools import cache
 
 import click
 
 from claude_sandbox.args import Args
-from claude_sandbox.docker import (
-    build_docker_args,
-    build_image,
-    check_container_exists,
-    check_image_exists,
-    ensure_volume_exists,
-)
-from claude_sandbox.system import (
-    check_pulseaudio_running,
-    get_git_config,
-    get_macos_audio_devices,
-    start_pulseaudio,
-    sync_pulseaudio_defaults,
-    validate_github_requirements,
-)
 
 IMAGE_NAME = "claude-sandbox"
 
 
+@cache
 def get_script_dir() -> str:
     """Get the directory containing the script/package."""
+    from pathlib import Path
+
     # When installed as a package, use the package directory
     # When run directly, use the script's directory
     return str(Path(__file__).parent.parent.parent)
 
 
+def build_docker_cmd(
+    args: Args,
+    github_config: dict[str, str] | None,
+    env: Mapping[str, str],
+) -> list[str]:
+    """Build the full ``docker run`` command for a sandbox launch.
+
+    Args:
+        args: Parsed command-line arguments.
+        github_config: Git identity to pass into the container, or None.
+        env: Host environment to read ANTHROPIC_API_KEY and TERM from.
+
+    Returns:
+        The docker command, ending with the command run in the container.
+    """
+    from claude_sandbox.docker import build_docker_args
+
+    docker_args = build_docker_args(
+        container_name=args.container_name,
+        volume_name=args.volume_name,
+        workspace_volume_name=args.workspace_volume_name,
+        host_ports=args.host_ports,
+        enable_github=args.enable_github,
+        github_config=github_config,
+        api_key=env.get("ANTHROPIC_API_KEY", ""),
+        term=env.get("TERM", "xterm-256color"),
+    )
+    if args.detach_mode:
+        return ["docker", "run", "-d", *docker_args, IMAGE_NAME, "sleep", "infinity"]
+    return ["docker", "run", "-it", *docker_args, IMAGE_NAME, "/bin/bash"]
+
+
 def run_sandbox(args: Args) -> None:
     """Run the Claude sandbox.
 
     Args:
         args: Parsed command-line arguments.
     """
-    script_dir = get_script_dir()
+    # Deferred so that --help and usage errors don't pay for subprocess and
+    # the Docker/system helpers.
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    from claude_sandbox.docker import (
+        build_image,
+        check_container_exists,
+        check_image_exists,
+        ensure_volumes_exist,
+    )
+    from claude_sandbox.system import (
+        check_pulseaudio_running,
+        get_git_config,
+        get_macos_audio_devices,
+        start_pulseaudio,
+        sync_pulseaudio_defaults,
+        validate_github_requirements,
+    )
+
+    # The probes below are independent subprocess calls, so run them together
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        pulseaudio_running = pool.submit(check_pulseaudio_running)
+        image_exists = pool.submit(check_image_exists, IMAGE_NAME)
+        container_exists = pool.submit(check_container_exists, args.container_name)
+        audio_devices = None if args.detach_mode else pool.submit(get_macos_audio_devices)
+        git_config = pool.submit(get_git_config) if args.enable_github else None
 
     # Ensure PulseAudio is running
-    if not check_pulseaudio_running():
+    if not pulseaudio_running.result():
         print("PulseAudio is not running. Starting it...")
         if not start_pulseaudio():
             print("ERROR: Could not start PulseAudio.", file=sys.stderr)
@@ -51,47 +97,47 @@ def run_sandbox(args: Args) -> None:
             sys.exit(1)
 
     # Check/build Docker image
-    if not check_image_exists(IMAGE_NAME):
+    if not image_exists.result():
         print(f"Docker image '{IMAGE_NAME}' not found. Building...")
-        if not build_image(IMAGE_NAME, script_dir):
+        if not build_image(IMAGE_NAME, get_script_dir()):
             print("ERROR: Failed to build Docker image.", file=sys.stderr)
             sys.exit(1)
 
     # Check for existing container
-    if check_container_exists(args.container_name):
+    if container_exists.result():
         print(f"ERROR: Container '{args.container_name}' already exists.", file=sys.stderr)
         print(f"Stop it first with: docker stop {args.container_name}", file=sys.stderr)
         sys.exit(1)
 
     # Validate GitHub requirements if enabled
     github_config = None
-    if args.enable_github:
-        git_config = get_git_config()
-        valid, errors = validate_github_requirements(git_config)
+    if git_config is not None:
+        valid, errors = validate_github_requirements(git_config.result())
         if not valid:
             print("ERROR: --github requires additional configuration:", file=sys.stderr)
             for error in errors:
                 print(f"  {error}", file=sys.stderr)
             sys.exit(1)
-        github_config = git_config
+        github_config = git_config.result()
 
     # Ensure volumes exist
     print(f"Creating persistent volume '{args.volume_name}' for profile '{args.profile}'...")
-    if not ensure_volume_exists(args.volume_name):
-        print(f"ERROR: Failed to create volume '{args.volume_name}'.", file=sys.stderr)
-        sys.exit(1)
-    if not ensure_volume_exists(args.workspace_volume_name):
-        print(f"ERROR: Failed to create volume '{args.workspace_volume_name}'.", file=sys.stderr)
+    if not ensure_volumes_exist([args.volume_name, args.workspace_volume_name]):
+        print(
+            f"ERROR: Failed to create volumes for profile '{args.profile}'.",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
-    # Sync audio devices
-    output_dev, input_dev = get_macos_audio_devices()
-    if output_dev or input_dev:
-        sink, source = sync_pulseaudio_defaults(output_dev, input_dev)
-        if sink:
-            print(f"Audio output: {output_dev}")
-        if source:
-            print(f"Audio input: {input_dev}")
+    # Sync audio devices (skipped when detached, since nothing plays until attach)
+    if audio_devices is not None:
+        output_dev, input_dev = audio_devices.result()
+        if output_dev or input_dev:
+            sink, source = sync_pulseaudio_defaults(output_dev, input_dev)
+            if sink:
+                print(f"Audio output: {output_dev}")
+            if source:
+                print(f"Audio input: {input_dev}")
 
     if args.enable_github and github_config:
         print(
@@ -99,22 +145,11 @@ def run_sandbox(args: Args) -> None:
             f"(git user: {github_config['user_name']} <{github_config['user_email']}>)"
         )
 
-    # Build Docker arguments
-    docker_args = build_docker_args(
-        container_name=args.container_name,
-        volume_name=args.volume_name,
-        workspace_volume_name=args.workspace_volume_name,
-        host_ports=args.host_ports,
-        enable_github=args.enable_github,
-        github_config=github_config,
-        api_key=os.environ.get("ANTHROPIC_API_KEY", ""),
-        term=os.environ.get("TERM", "xterm-256color"),
-    )
-
     # Build the command
+    cmd = build_docker_cmd(args, github_config, os.environ)
+
     if args.detach_mode:
         print(f"Starting Claude sandbox in detached mode (profile: {args.profile})")
-        cmd = ["docker", "run", "-d", *docker_args, IMAGE_NAME, "sleep", "infinity"]
         result = subprocess.run(cmd, capture_output=True, check=False)
         if result.returncode != 0:
             print("ERROR: Failed to start container.", file=sys.stderr)
@@ -134,8 +169,9 @@ def run_sandbox(args: Args) -> None:
         print(f"  docker stop {args.container_name}")
     else:
         print(f"Launching Claude sandbox (profile: {args.profile})")
-        cmd = ["docker", "run", "-it", *docker_args, IMAGE_NAME, "/bin/bash"]
-        subprocess.run(cmd, check=False)
+        # Hand the terminal to docker directly instead of waiting on it
+        sys.stdout.flush()
+        os.execvp(cmd[0], cmd)
 
 
 @click.command(context_settings={"help_option_names": ["-h", "--help"]})
@@ -167,6 +203,6 @@ def main(profile: str, github: bool, detach: bool, host_port: tuple[int, ...]) -
         profile=profile,
         enable_github=github,
         detach_mode=detach,
-        host_ports=list(host_port),
+        host_ports=host_port,
     )
     run_sandbox(args)
@@ -1,30 +1,54 @@
 """Docker operations for claude-sandbox."""
 
 import subprocess
+from collections.abc import Sequence
 
+# Arguments that are the same for every container
+_STATIC_DOCKER_ARGS = (
+    "--rm",
+    "--cap-add=NET_ADMIN",
+    "--add-host=host.docker.internal:host-gateway",
+    "-e", "PULSE_SERVER=tcp:host.docker.internal:4713",
+)
 
-def ensure_volume_exists(volume_name: str) -> bool:
-    """Ensure a Docker volume exists, creating it if necessary.
+# SSH agent forwarding for --github (Docker Desktop's host-services socket)
+_GITHUB_DOCKER_ARGS = (
+    "-v", "/run/host-services/ssh-auth.sock:/run/host-services/ssh-auth.sock",
+    "-e", "SSH_AUTH_SOCK=/run/host-services/ssh-auth.sock",
+)
+
+
+def ensure_volumes_exist(volume_names: list[str]) -> bool:
+    """Ensure Docker volumes exist, creating any that are missing.
+
+    All volumes are checked with a single ``docker volume inspect`` call.
 
     Returns:
-        True if volume exists or was created successfully, False otherwise.
+        True if all volumes exist or were created successfully, False otherwise.
     """
-    # Check if volume exists
+    # Check which volumes exist
     result = subprocess.run(
-        ["docker", "volume", "inspect", volume_name],
+        ["docker", "volume", "inspect", "--format", "{{.Name}}", *volume_names],
         capture_output=True,
         check=False,
     )
     if result.returncode == 0:
         return True
 
-    # Volume doesn't exist, create it
-    result = subprocess.run(
-        ["docker", "volume", "create", volume_name],
-        capture_output=True,
-        check=False,
-    )
-    return result.returncode == 0
+    # inspect still prints the volumes it did find; create the rest
+    existing = result.stdout.splitlines()
+    for volume_name in volume_names:
+        if volume_name.encode() in existing:
+            continue
+        result = subprocess.run(
+            ["docker", "volume", "create", volume_name],
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            return False
+
+    return True
 
 
 def check_image_exists(image_name: str) -> bool:
@@ -53,46 +77,38 @@ def build_image(image_name: str, context_path: str) -> bool:
 def check_container_exists(container_name: str) -> bool:
     """Check if a Docker container exists (running or stopped)."""
     result = subprocess.run(
-        ["docker", "ps", "-a", "--format", "{{.Names}}"],
+        ["docker", "container", "inspect", "--format", "{{.Id}}", container_name],
         capture_output=True,
         check=False,
     )
-    if result.returncode != 0:
-        return False
-
-    containers = result.stdout.decode().strip().split("\n")
-    return container_name in containers
+    return result.returncode == 0
 
 
 def build_docker_args(
     container_name: str,
     volume_name: str,
     workspace_volume_name: str,
-    host_ports: list[int],
+    host_ports: Sequence[int],
     enable_github: bool,
     github_config: dict[str, str] | None,
     api_key: str,
     term: str,
 ) -> list[str]:
     """Build Docker run command arguments."""
-    args = [
-        "--rm",
-        "--cap-add=NET_ADMIN",
-        "--add-host=host.docker.internal:host-gateway",
+    args = list(_STATIC_DOCKER_ARGS)
+    args.extend([
         "-v", f"{volume_name}:/home/claude",
         "-v", f"{workspace_volume_name}:/workspace",
-        "-e", "PULSE_SERVER=tcp:host.docker.internal:4713",
         "-e", f"ANTHROPIC_API_KEY={api_key}",
         "-e", f"TERM={term}",
-        "-e", f"HOST_PORTS={' '.join(str(p) for p in host_ports)}",
+        "-e", f"HOST_PORTS={' '.join(map(str, host_ports)) if host_ports else ''}",
         "--hostname", container_name,
         "--name", container_name,
-    ]
+    ])
 
     if enable_github and github_config:
+        args.extend(_GITHUB_DOCKER_ARGS)
         args.extend([
-            "-v", "/run/host-services/ssh-auth.sock:/run/host-services/ssh-auth.sock",
-            "-e", "SSH_AUTH_SOCK=/run/host-services/ssh-auth.sock",
             "-e", f"GIT_AUTHOR_NAME={github_config['user_name']}",
             "-e", f"GIT_AUTHOR_EMAIL={github_config['user_email']}",
             "-e", f"GIT_COMMITTER_NAME={github_config['user_name']}",
@@ -1,11 +1,30 @@
 """System operations for audio and GitHub setup."""
 
+import json
 import os
+import re
+import socket
 import subprocess
+from collections.abc import Iterable, Iterator, Mapping
+
+# Address of the host's PulseAudio TCP module (see setup-host-audio.sh)
+_PULSEAUDIO_TCP_ADDRESS = ("127.0.0.1", 4713)
+
+_PACTL_FIELD_RE = re.compile(rb"^[ \t]*(Name|Description):[ \t]*(.*?)[ \t]*$", re.MULTILINE)
 
 
 def check_pulseaudio_running() -> bool:
-    """Check if PulseAudio is running."""
+    """Check if PulseAudio is running.
+
+    Connecting to the TCP port the container uses is much cheaper than
+    running ``pulseaudio --check``, which is only used if nothing answers.
+    """
+    try:
+        with socket.create_connection(_PULSEAUDIO_TCP_ADDRESS, timeout=0.1):
+            return True
+    except OSError:
+        pass
+
     result = subprocess.run(
         ["pulseaudio", "--check"],
         capture_output=True,
@@ -60,50 +79,67 @@ def get_macos_audio_devices() -> tuple[str | None, str | None]:
         return None, None
 
 
-def _find_pulseaudio_device(
-    device_type: str,
-    description: str,
-) -> str | None:
-    """Find a PulseAudio device by description.
+def _list_pulseaudio_devices(device_type: str) -> dict[str, str]:
+    """List PulseAudio devices keyed by description.
 
     Args:
         device_type: "sinks" or "sources"
-        description: Device description to match
 
     Returns:
-        Device name or None if not found.
+        Dict mapping device description to device name, empty if pactl fails.
     """
+    result = subprocess.run(
+        ["pactl", "-f", "json", "list", device_type],
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode == 0:
+        try:
+            entries = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            pass
+        else:
+            return _index_pulseaudio_devices(
+                device_type,
+                ((entry["name"], entry["description"]) for entry in entries),
+            )
+
+    # pactl older than 16.0 has no JSON output; fall back to the text format
     result = subprocess.run(
         ["pactl", "list", device_type],
         capture_output=True,
         check=False,
     )
     if result.returncode != 0:
-        return None
+        return {}
+
+    return _index_pulseaudio_devices(device_type, _parse_pactl_text(result.stdout))
 
-    output = result.stdout.decode()
-    # Parse pactl output to find device name by description
-    # Format:
-    # Name: device.name
-    # ...
-    # Description: Device Description
 
-    lines = output.split("\n")
+def _parse_pactl_text(output: bytes) -> Iterator[tuple[str, str]]:
+    """Yield (name, description) pairs from textual ``pactl list`` output."""
+    # pactl prints each device's "Name:" line before its "Description:" line;
+    # only the matched values are decoded, not the whole dump
     current_name = None
+    for field, value in _PACTL_FIELD_RE.findall(output):
+        if field == b"Name":
+            current_name = value.decode()
+        elif current_name:
+            yield current_name, value.decode()
 
-    for line in lines:
-        line = line.strip()
-        if line.startswith("Name:"):
-            current_name = line.split(":", 1)[1].strip()
-        elif line.startswith("Description:"):
-            desc = line.split(":", 1)[1].strip()
-            if desc == description:
-                # For sources, skip .monitor entries
-                if device_type == "sources" and current_name and ".monitor" in current_name:
-                    continue
-                return current_name
 
-    return None
+def _index_pulseaudio_devices(
+    device_type: str,
+    devices: Iterable[tuple[str, str]],
+) -> dict[str, str]:
+    """Map descriptions to device names, keeping the first match."""
+    index: dict[str, str] = {}
+    for name, description in devices:
+        # For sources, skip .monitor entries
+        if device_type == "sources" and ".monitor" in name:
+            continue
+        index.setdefault(description, name)
+    return index
 
 
 def sync_pulseaudio_defaults(
@@ -119,7 +155,7 @@ def sync_pulseaudio_defaults(
     source = None
 
     if output_device:
-        sink = _find_pulseaudio_device("sinks", output_device)
+        sink = _list_pulseaudio_devices("sinks").get(output_device)
         if sink:
             subprocess.run(
                 ["pactl", "set-default-sink", sink],
@@ -128,7 +164,7 @@ def sync_pulseaudio_defaults(
             )
 
     if input_device:
-        source = _find_pulseaudio_device("sources", input_device)
+        source = _list_pulseaudio_devices("sources").get(input_device)
         if source:
             subprocess.run(
                 ["pactl", "set-default-source", source],
@@ -145,37 +181,43 @@ def get_git_config() -> dict[str, str | None]:
     Returns:
         Dict with user_name and user_email, values may be None if not set.
     """
-    def get_config_value(key: str) -> str | None:
-        result = subprocess.run(
-            ["git", "config", "--global", key],
-            capture_output=True,
-            check=False,
-        )
-        if result.returncode == 0 and result.stdout:
-            return result.stdout.decode().strip()
-        return None
+    result = subprocess.run(
+        ["git", "config", "--global", "--get-regexp", r"^user\.(name|email)$"],
+        capture_output=True,
+        check=False,
+    )
+    values: dict[str, str] = {}
+    if result.returncode == 0:
+        # Each line is "<key> <value>", e.g. "user.name Jane Doe"
+        for line in result.stdout.decode().splitlines():
+            key, _, value = line.partition(" ")
+            if value := value.strip():
+                values[key] = value
 
     return {
-        "user_name": get_config_value("user.name"),
-        "user_email": get_config_value("user.email"),
+        "user_name": values.get("user.name"),
+        "user_email": values.get("user.email"),
     }
 
 
 def validate_github_requirements(
     git_config: dict[str, str | None],
+    env: Mapping[str, str] | None = None,
 ) -> tuple[bool, list[str]]:
     """Validate requirements for GitHub access.
 
     Args:
         git_config: Dict from get_git_config()
+        env: Environment to check for SSH_AUTH_SOCK (default: os.environ)
 
     Returns:
         Tuple of (is_valid, list_of_error_messages)
     """
+    env = env if env is not None else os.environ
     errors: list[str] = []
 
     # Check SSH agent
-    ssh_sock = os.environ.get("SSH_AUTH_SOCK")
+    ssh_sock = env.get("SSH_AUTH_SOCK")
     if not ssh_sock:
         errors.append(
             "SSH agent not running. Start it with:\n"
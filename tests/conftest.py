@@ -0,0 +1,128 @@
+"""Shared fixtures for claude-sandbox tests.
+
+Mocks here and in the test modules are plain MagicMocks with explicit
+return values; none use autospec or spec, which introspect the target on
+every patch. Keep it that way unless a test really needs signature checks.
+"""
+
+import subprocess
+from collections import deque
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+# (module, {attribute: return value}) for every helper run_sandbox reaches out
+# through. The docker/system helpers are imported lazily inside run_sandbox, so
+# they are patched where they are defined rather than on claude_sandbox.cli.
+_CLI_EXTERNALS = (
+    ("claude_sandbox.system", {
+        "check_pulseaudio_running": True,
+        "start_pulseaudio": True,
+        "get_macos_audio_devices": (None, None),
+        "sync_pulseaudio_defaults": (None, None),
+    }),
+    ("claude_sandbox.docker", {
+        "check_image_exists": True,
+        "check_container_exists": False,
+        "ensure_volumes_exist": True,
+        "build_image": True,
+    }),
+    ("claude_sandbox.cli", {"get_script_dir": "/tmp/test"}),
+)
+
+_GITHUB_EXTERNALS = (
+    ("claude_sandbox.system", {
+        "get_git_config": {"user_name": "Test User", "user_email": "test@example.com"},
+        "validate_github_requirements": (True, []),
+    }),
+)
+
+_GIT_CONFIG_OUTPUT = b"user.name Test User\nuser.email test@example.com\n"
+
+_FAKE_ENV = {"ANTHROPIC_API_KEY": "test-api-key", "TERM": "xterm-256color"}
+_FAKE_ENV_GH = {**_FAKE_ENV, "SSH_AUTH_SOCK": "/tmp/ssh.sock"}
+
+# Nothing inspects or mutates the result of a successful docker run, so one
+# instance serves every test.
+_RUN_OK = subprocess.CompletedProcess([], 0)
+
+
+def _patch_all(mocker, externals):
+    """Patch each module's helpers in one patch.multiple call, keyed by attribute name."""
+    mocks = {}
+    for module, return_values in externals:
+        patched = mocker.patch.multiple(module, **dict.fromkeys(return_values, mocker.DEFAULT))
+        for name, patched_mock in patched.items():
+            patched_mock.return_value = return_values[name]
+        mocks |= patched
+    return mocks
+
+
+class _FakeSubprocess:
+    """Hands queued CompletedProcess results to a patched subprocess.run in order."""
+
+    def __init__(self, mock_run):
+        self.run = mock_run
+        self._results = deque()
+        mock_run.side_effect = lambda *args, **kwargs: self._results.popleft()
+
+    def queue(self, returncode, stdout=b""):
+        """Queue the result of the next subprocess.run call."""
+        self._results.append(subprocess.CompletedProcess([], returncode, stdout=stdout))
+
+
+@pytest.fixture
+def fake_subprocess(mocker):
+    """Patch subprocess.run to return results queued with .queue(rc, stdout)."""
+    return _FakeSubprocess(mocker.patch.object(subprocess, "run"))
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Click CLI test runner; it holds no state between invocations."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def cached_git_config():
+    """get_git_config() parsed once from canned git output.
+
+    The result is shared between tests, so treat it as read-only.
+    """
+    from claude_sandbox.system import get_git_config
+
+    # mocker is function-scoped, so patch directly for this one call
+    completed = subprocess.CompletedProcess([], 0, stdout=_GIT_CONFIG_OUTPUT)
+    with mock.patch.object(subprocess, "run", return_value=completed) as mock_run:
+        config = get_git_config()
+    mock_run.assert_called_once_with(
+        ["git", "config", "--global", "--get-regexp", r"^user\.(name|email)$"],
+        capture_output=True,
+        check=False,
+    )
+    return config
+
+
+@pytest.fixture
+def mock_cli_externals(mocker, monkeypatch):
+    """Mock every external call made by run_sandbox.
+
+    Returns the mocks keyed by attribute name; ``execvp`` receives the
+    interactive command and ``run`` the detached one.
+    """
+    mocks = _patch_all(mocker, _CLI_EXTERNALS)
+    for name, value in _FAKE_ENV.items():
+        monkeypatch.setenv(name, value)
+    mocks["execvp"] = mocker.patch("os.execvp")
+    mocks["run"] = mocker.patch.object(subprocess, "run", return_value=_RUN_OK)
+    return mocks
+
+
+@pytest.fixture
+def mock_github_externals(mocker, monkeypatch, mock_cli_externals):
+    """Extend mock_cli_externals with a usable git config and SSH agent."""
+    mock_cli_externals.update(_patch_all(mocker, _GITHUB_EXTERNALS))
+    for name, value in _FAKE_ENV_GH.items():
+        monkeypatch.setenv(name, value)
+    return mock_cli_externals
@@ -1,8 +1,18 @@
 """Tests for Args dataclass."""
 
+import dataclasses
+
+import pytest
+
 from claude_sandbox.args import Args
 
 
+@pytest.fixture
+def work_args():
+    """Args for the 'work' profile."""
+    return Args(profile="work")
+
+
 class TestArgsDataclass:
     """Test the Args dataclass."""
 
@@ -12,13 +22,13 @@ class TestArgsDataclass:
             profile="test",
             enable_github=True,
             detach_mode=True,
-            host_ports=[8080, 3000],
+            host_ports=(8080, 3000),
         )
 
         assert args.profile == "test"
         assert args.enable_github is True
         assert args.detach_mode is True
-        assert args.host_ports == [8080, 3000]
+        assert args.host_ports == (8080, 3000)
 
     def test_args_defaults(self):
         """Args has sensible defaults."""
@@ -27,22 +37,21 @@ class TestArgsDataclass:
         assert args.profile == "default"
         assert args.enable_github is False
         assert args.detach_mode is False
-        assert args.host_ports == []
-
-    def test_volume_name_property(self):
-        """Args has a volume_name property."""
-        args = Args(profile="work")
-
-        assert args.volume_name == "claude-sandbox-work"
-
-    def test_workspace_volume_name_property(self):
-        """Args has a workspace_volume_name property."""
-        args = Args(profile="work")
-
-        assert args.workspace_volume_name == "claude-sandbox-work-workspace"
-
-    def test_container_name_property(self):
-        """Args has a container_name property."""
-        args = Args(profile="work")
-
-        assert args.container_name == "claude-sandbox-work"
+        assert args.host_ports == ()
+
+    def test_args_are_frozen(self, work_args):
+        """Args can't be modified after parsing."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            work_args.profile = "other"
+
+    @pytest.mark.parametrize(
+        ("attr", "expected"),
+        [
+            ("volume_name", "claude-sandbox-work"),
+            ("workspace_volume_name", "claude-sandbox-work-workspace"),
+            ("container_name", "claude-sandbox-work"),
+        ],
+    )
+    def test_args_derived_names(self, work_args, attr, expected):
+        """Volume and container names are derived from the profile."""
+        assert getattr(work_args, attr) == expected
@@ -2,172 +2,172 @@
 
 import subprocess
 
+import pytest
+
 from claude_sandbox.docker import (
     build_docker_args,
     build_image,
     check_container_exists,
     check_image_exists,
-    ensure_volume_exists,
+    ensure_volumes_exist,
 )
 
-
-class TestEnsureVolumeExists:
+OK = subprocess.CompletedProcess(args=[], returncode=0)
+FAIL = subprocess.CompletedProcess(args=[], returncode=1)
+
+
+def _index(docker_args: list[str]) -> tuple[dict[str, str], list[str]]:
+    """Split docker args into an env var dict and a list of volume mounts."""
+    env: dict[str, str] = {}
+    mounts: list[str] = []
+    for flag, value in zip(docker_args, docker_args[1:], strict=False):
+        if flag == "-e":
+            key, _, val = value.partition("=")
+            env[key] = val
+        elif flag == "-v":
+            mounts.append(value)
+    return env, mounts
+
+
+@pytest.fixture(scope="session")
+def basic_docker_args():
+    """Docker args for the default profile without optional features."""
+    return build_docker_args(
+        container_name="claude-sandbox-default",
+        volume_name="claude-sandbox-default",
+        workspace_volume_name="claude-sandbox-default-workspace",
+        host_ports=[],
+        enable_github=False,
+        github_config=None,
+        api_key="test-key",
+        term="xterm-256color",
+    )
+
+
+@pytest.fixture(scope="session")
+def github_docker_args():
+    """Docker args for the default profile with GitHub access enabled."""
+    return build_docker_args(
+        container_name="claude-sandbox-default",
+        volume_name="claude-sandbox-default",
+        workspace_volume_name="claude-sandbox-default-workspace",
+        host_ports=[],
+        enable_github=True,
+        github_config={"user_name": "Test User", "user_email": "test@example.com"},
+        api_key="",
+        term="xterm",
+    )
+
+
+class TestEnsureVolumesExist:
     """Test Docker volume management."""
 
-    def test_creates_volume_if_not_exists(self, mocker):
-        """Creates volume when it doesn't exist."""
-        mock_run = mocker.patch("subprocess.run")
-        # First call (inspect) fails, second call (create) succeeds
-        mock_run.side_effect = [
-            subprocess.CompletedProcess([], 1),  # inspect fails
-            subprocess.CompletedProcess([], 0),  # create succeeds
+    @pytest.mark.parametrize(
+        ("side_effect", "expected", "created"),
+        [
+            pytest.param(
+                [subprocess.CompletedProcess([], 1, stdout=b"home-volume\n"), OK],
+                True,
+                ["workspace-volume"],
+                id="created",
+            ),
+            pytest.param([OK], True, [], id="skipped"),
+            pytest.param(
+                [subprocess.CompletedProcess([], 1, stdout=b""), FAIL],
+                False,
+                ["home-volume"],
+                id="failed",
+            ),
+        ],
+    )
+    def test_ensure_volumes_exist(self, mocker, side_effect, expected, created):
+        """Inspects all volumes at once and creates only the missing ones."""
+        mock_run = mocker.patch.object(subprocess, "run")
+        mock_run.side_effect = side_effect
+
+        result = ensure_volumes_exist(["home-volume", "workspace-volume"])
+
+        assert result is expected
+        assert mock_run.call_args_list[0].args[0] == [
+            "docker", "volume", "inspect", "--format", "{{.Name}}",
+            "home-volume", "workspace-volume",
         ]
-
-        result = ensure_volume_exists("test-volume")
-
-        assert result is True
-        assert mock_run.call_count == 2
-        mock_run.assert_any_call(
-            ["docker", "volume", "inspect", "test-volume"],
-            capture_output=True,
-            check=False,
-        )
-        mock_run.assert_any_call(
-            ["docker", "volume", "create", "test-volume"],
-            capture_output=True,
-            check=False,
-        )
-
-    def test_skips_creation_if_exists(self, mocker):
-        """Skips creation when volume already exists."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-
-        result = ensure_volume_exists("test-volume")
-
-        assert result is True
-        mock_run.assert_called_once_with(
-            ["docker", "volume", "inspect", "test-volume"],
-            capture_output=True,
-            check=False,
-        )
-
-    def test_returns_false_on_create_failure(self, mocker):
-        """Returns False when volume creation fails."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = [
-            subprocess.CompletedProcess([], 1),  # inspect fails
-            subprocess.CompletedProcess([], 1),  # create fails
+        assert [c.args[0] for c in mock_run.call_args_list[1:]] == [
+            ["docker", "volume", "create", name] for name in created
         ]
 
-        result = ensure_volume_exists("test-volume")
-
-        assert result is False
-
 
 class TestCheckImageExists:
     """Test Docker image existence checks."""
 
-    def test_returns_true_when_image_exists(self, mocker):
-        """Returns True when image exists."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
+    @pytest.mark.parametrize(
+        ("completed", "expected"),
+        [pytest.param(OK, True, id="exists"), pytest.param(FAIL, False, id="missing")],
+    )
+    def test_check_image_exists(self, mocker, completed, expected):
+        """Reports whether docker can inspect the image."""
+        mock_run = mocker.patch.object(subprocess, "run")
+        mock_run.return_value = completed
 
         result = check_image_exists("claude-sandbox")
 
-        assert result is True
+        assert result is expected
         mock_run.assert_called_once_with(
             ["docker", "image", "inspect", "claude-sandbox"],
             capture_output=True,
             check=False,
         )
 
-    def test_returns_false_when_image_missing(self, mocker):
-        """Returns False when image doesn't exist."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 1)
-
-        result = check_image_exists("claude-sandbox")
-
-        assert result is False
-
 
 class TestBuildImage:
     """Test Docker image building."""
 
-    def test_builds_image_successfully(self, mocker):
-        """Builds image and returns True on success."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
+    @pytest.mark.parametrize(
+        ("completed", "expected"),
+        [pytest.param(OK, True, id="success"), pytest.param(FAIL, False, id="failure")],
+    )
+    def test_build_image(self, mocker, completed, expected):
+        """Builds the image and reports whether the build succeeded."""
+        mock_run = mocker.patch.object(subprocess, "run")
+        mock_run.return_value = completed
 
         result = build_image("claude-sandbox", "/path/to/context")
 
-        assert result is True
+        assert result is expected
         mock_run.assert_called_once_with(
             ["docker", "build", "-t", "claude-sandbox", "/path/to/context"],
             check=False,
         )
 
-    def test_returns_false_on_build_failure(self, mocker):
-        """Returns False when build fails."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 1)
-
-        result = build_image("claude-sandbox", "/path/to/context")
-
-        assert result is False
-
 
 class TestCheckContainerExists:
     """Test container existence checks."""
 
-    def test_returns_true_when_container_exists(self, mocker):
-        """Returns True when container exists."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess(
-            [], 0, stdout=b"claude-sandbox-work\n"
-        )
+    @pytest.mark.parametrize(
+        ("completed", "expected"),
+        [pytest.param(OK, True, id="exists"), pytest.param(FAIL, False, id="missing")],
+    )
+    def test_check_container_exists(self, mocker, completed, expected):
+        """Reports whether docker can inspect the named container."""
+        mock_run = mocker.patch.object(subprocess, "run")
+        mock_run.return_value = completed
 
         result = check_container_exists("claude-sandbox-work")
 
-        assert result is True
-
-    def test_returns_false_when_container_missing(self, mocker):
-        """Returns False when container doesn't exist."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess(
-            [], 0, stdout=b"other-container\n"
+        assert result is expected
+        mock_run.assert_called_once_with(
+            ["docker", "container", "inspect", "--format", "{{.Id}}", "claude-sandbox-work"],
+            capture_output=True,
+            check=False,
         )
 
-        result = check_container_exists("claude-sandbox-work")
-
-        assert result is False
-
-    def test_returns_false_on_empty_output(self, mocker):
-        """Returns False when no containers exist."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"")
-
-        result = check_container_exists("claude-sandbox-work")
-
-        assert result is False
-
 
 class TestBuildDockerArgs:
     """Test Docker run command argument building."""
 
-    def test_basic_args(self):
+    def test_basic_args(self, basic_docker_args):
         """Builds basic docker args without optional features."""
-        args = build_docker_args(
-            container_name="claude-sandbox-default",
-            volume_name="claude-sandbox-default",
-            workspace_volume_name="claude-sandbox-default-workspace",
-            host_ports=[],
-            enable_github=False,
-            github_config=None,
-            api_key="test-key",
-            term="xterm-256color",
-        )
+        args = basic_docker_args
 
         assert "--rm" in args
         assert "--cap-add=NET_ADMIN" in args
@@ -194,72 +194,30 @@ class TestBuildDockerArgs:
             term="xterm",
         )
 
-        # Find the HOST_PORTS environment variable
-        host_ports_found = False
-        for i, arg in enumerate(args):
-            if arg == "-e" and i + 1 < len(args) and args[i + 1].startswith("HOST_PORTS="):
-                host_ports_found = True
-                assert args[i + 1] == "HOST_PORTS=8080 3000"
-                break
-        assert host_ports_found
-
-    def test_with_github_enabled(self):
-        """Includes GitHub-related args when enabled."""
-        github_config = {
-            "user_name": "Test User",
-            "user_email": "test@example.com",
-        }
-
-        args = build_docker_args(
-            container_name="claude-sandbox-default",
-            volume_name="claude-sandbox-default",
-            workspace_volume_name="claude-sandbox-default-workspace",
-            host_ports=[],
-            enable_github=True,
-            github_config=github_config,
-            api_key="",
-            term="xterm",
-        )
-
-        # Check for SSH socket mount
-        ssh_mount_found = False
-        for i, arg in enumerate(args):
-            if arg == "-v" and i + 1 < len(args) and "ssh-auth.sock" in args[i + 1]:
-                ssh_mount_found = True
-                break
-        assert ssh_mount_found
-
-        # Check for SSH_AUTH_SOCK env var
-        ssh_env_found = False
-        for i, arg in enumerate(args):
-            if arg == "-e" and i + 1 < len(args) and args[i + 1].startswith("SSH_AUTH_SOCK="):
-                ssh_env_found = True
-                break
-        assert ssh_env_found
-
-        # Check for git author/committer env vars
-        assert any("GIT_AUTHOR_NAME=Test User" in arg for arg in args)
-        assert any("GIT_AUTHOR_EMAIL=test@example.com" in arg for arg in args)
-        assert any("GIT_COMMITTER_NAME=Test User" in arg for arg in args)
-        assert any("GIT_COMMITTER_EMAIL=test@example.com" in arg for arg in args)
-
-    def test_pulse_server_configured(self):
+        env, _ = _index(args)
+        assert env["HOST_PORTS"] == "8080 3000"
+
+    def test_with_github_enabled(self, github_docker_args):
+        """Mounts the SSH agent socket when GitHub access is enabled."""
+        env, mounts = _index(github_docker_args)
+        assert any("ssh-auth.sock" in m for m in mounts)
+        assert "SSH_AUTH_SOCK" in env
+
+    @pytest.mark.parametrize(
+        ("key", "val"),
+        [
+            ("GIT_AUTHOR_NAME", "Test User"),
+            ("GIT_AUTHOR_EMAIL", "test@example.com"),
+            ("GIT_COMMITTER_NAME", "Test User"),
+            ("GIT_COMMITTER_EMAIL", "test@example.com"),
+        ],
+    )
+    def test_github_sets_git_env(self, github_docker_args, key, val):
+        """Passes the git identity through as author and committer env vars."""
+        env, _ = _index(github_docker_args)
+        assert env[key] == val
+
+    def test_pulse_server_configured(self, basic_docker_args):
         """Includes PulseAudio server configuration."""
-        args = build_docker_args(
-            container_name="test",
-            volume_name="test",
-            workspace_volume_name="test-workspace",
-            host_ports=[],
-            enable_github=False,
-            github_config=None,
-            api_key="",
-            term="xterm",
-        )
-
-        pulse_found = False
-        for i, arg in enumerate(args):
-            if arg == "-e" and i + 1 < len(args) and "PULSE_SERVER=" in args[i + 1]:
-                pulse_found = True
-                assert "tcp:host.docker.internal:4713" in args[i + 1]
-                break
-        assert pulse_found
+        env, _ = _index(basic_docker_args)
+        assert env["PULSE_SERVER"] == "tcp:host.docker.internal:4713"
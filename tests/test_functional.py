@@ -1,112 +1,143 @@
 """Functional tests for claude-sandbox end-to-end behavior."""
 
-import subprocess
+import os
+from dataclasses import replace
 
 import pytest
-from click.testing import CliRunner
 
 from claude_sandbox.args import Args
-from claude_sandbox.cli import main, run_sandbox
+from claude_sandbox.cli import build_docker_cmd, main, run_sandbox
+
+ALL_OPTIONS_ARGV = [
+    "--github",
+    "-d",
+    "--host-port", "8080",
+    "--host-port", "3000",
+    "myproject",
+]
+
+_DEFAULT_ARGS = Args()
+_ENV = {"ANTHROPIC_API_KEY": "test-api-key", "TERM": "xterm-256color"}
+_GIT_CONFIG = {"user_name": "Test User", "user_email": "test@example.com"}
+_INTERACTIVE_TAIL = ["claude-sandbox", "/bin/bash"]
+_DETACHED_TAIL = ["claude-sandbox", "sleep", "infinity"]
+_SSH_AUTH_SOCK_ENV = "SSH_AUTH_SOCK=/run/host-services/ssh-auth.sock"
+
+
+@pytest.fixture(scope="module")
+def all_options_args(module_mocker, runner):
+    """Args parsed once from a command line that uses every option."""
+    mock_run = module_mocker.patch("claude_sandbox.cli.run_sandbox")
+    result = runner.invoke(main, ALL_OPTIONS_ARGV, catch_exceptions=False)
+    module_mocker.stop(mock_run)
+    assert result.exit_code == 0
+    return mock_run.call_args[0][0]
 
 
 class TestClickCli:
     """Test click CLI argument parsing."""
 
-    @pytest.fixture
-    def runner(self):
-        """Create a Click CLI test runner."""
-        return CliRunner()
-
     def test_no_args_uses_defaults(self, runner, mocker):
         """With no arguments, uses default profile."""
         mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, [])
-        assert result.exit_code == 0
-
-    def test_profile_argument(self, runner, mocker):
-        """Profile can be specified as positional argument."""
-        mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["work"])
-        assert result.exit_code == 0
-        args = mock_run.call_args[0][0]
-        assert args.profile == "work"
-
-    def test_github_flag(self, runner, mocker):
-        """--github flag enables GitHub access."""
-        mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["--github"])
+        result = runner.invoke(main, [], catch_exceptions=False)
         assert result.exit_code == 0
-        args = mock_run.call_args[0][0]
-        assert args.enable_github is True
 
-    def test_detach_long_flag(self, runner, mocker):
-        """--detach flag enables detached mode."""
+    @pytest.mark.parametrize(
+        ("argv", "profile", "github"),
+        [
+            (["work"], "work", False),
+            (["--github"], "default", True),
+            (["--github", "work"], "work", True),
+            (["work", "--github"], "work", True),
+        ],
+    )
+    def test_github_parsing(self, runner, mocker, argv, profile, github):
+        """Profile is positional and --github works on either side of it."""
         mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["--detach"])
+        result = runner.invoke(main, argv, catch_exceptions=False)
         assert result.exit_code == 0
         args = mock_run.call_args[0][0]
-        assert args.detach_mode is True
-
-    def test_detach_short_flag(self, runner, mocker):
-        """-d flag enables detached mode."""
+        assert args.profile == profile
+        assert args.enable_github is github
+
+    @pytest.mark.parametrize(
+        ("argv", "profile", "detach"),
+        [
+            (["--detach"], "default", True),
+            (["-d"], "default", True),
+            (["-d", "work"], "work", True),
+        ],
+    )
+    def test_detach_parsing(self, runner, mocker, argv, profile, detach):
+        """--detach and -d enable detached mode."""
         mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["-d"])
+        result = runner.invoke(main, argv, catch_exceptions=False)
         assert result.exit_code == 0
         args = mock_run.call_args[0][0]
-        assert args.detach_mode is True
+        assert args.profile == profile
+        assert args.detach_mode is detach
 
     def test_single_host_port(self, runner, mocker):
         """--host-port adds a port to the list."""
         mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["--host-port", "8080"])
+        result = runner.invoke(main, ["--host-port", "8080"], catch_exceptions=False)
         assert result.exit_code == 0
         args = mock_run.call_args[0][0]
-        assert args.host_ports == [8080]
+        assert args.host_ports == (8080,)
 
     def test_multiple_host_ports(self, runner, mocker):
         """Multiple --host-port flags accumulate."""
         mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["--host-port", "8080", "--host-port", "3000"])
+        result = runner.invoke(
+            main, ["--host-port", "8080", "--host-port", "3000"], catch_exceptions=False
+        )
         assert result.exit_code == 0
         args = mock_run.call_args[0][0]
-        assert args.host_ports == [8080, 3000]
-
-    def test_host_port_invalid_value_fails(self, runner, mocker):
-        """--host-port with non-numeric value fails."""
-        mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, ["--host-port", "abc"])
-        assert result.exit_code != 0
-
-    def test_host_port_out_of_range_fails(self, runner, mocker):
-        """--host-port with port outside 1-65535 fails."""
-        mocker.patch("claude_sandbox.cli.run_sandbox")
-
-        result = runner.invoke(main, ["--host-port", "0"])
-        assert result.exit_code != 0
-
-        result = runner.invoke(main, ["--host-port", "65536"])
+        assert args.host_ports == (8080, 3000)
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--host-port"],
+            ["--host-port", "abc"],
+            ["--host-port", "0"],
+            ["--host-port", "65536"],
+        ],
+        ids=["missing", "non-numeric", "too-low", "too-high"],
+    )
+    def test_host_port_invalid_value_fails(self, runner, mocker, argv):
+        """--host-port without a port in 1-65535 fails."""
+        mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
+        result = runner.invoke(main, argv)
         assert result.exit_code != 0
+        mock_run.assert_not_called()
 
-    def test_all_options_combined(self, runner, mocker):
-        """All options work together correctly."""
+    @pytest.mark.parametrize("argv", [["-v"], ["work", "-v", "--verbose"]])
+    def test_unknown_flags_rejected(self, runner, mocker, argv):
+        """Unknown flags are a usage error, with or without a profile."""
         mock_run = mocker.patch("claude_sandbox.cli.run_sandbox")
-        result = runner.invoke(main, [
-            "--github",
-            "-d",
-            "--host-port", "8080",
-            "--host-port", "3000",
-            "myproject",
-        ])
-        assert result.exit_code == 0
-        args = mock_run.call_args[0][0]
-        assert args.profile == "myproject"
-        assert args.enable_github is True
-        assert args.detach_mode is True
-        assert args.host_ports == [8080, 3000]
+        result = runner.invoke(main, argv)
+        assert result.exit_code == 2
+        assert "No such option" in result.output
+        mock_run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("attr", "expected"),
+        [
+            ("profile", "myproject"),
+            ("enable_github", True),
+            ("detach_mode", True),
+            ("host_ports", (8080, 3000)),
+        ],
+    )
+    def test_all_options_combined(self, all_options_args, attr, expected):
+        """All options work together correctly."""
+        assert getattr(all_options_args, attr) == expected
 
     def test_help_option(self, runner):
         """--help shows usage information."""
-        result = runner.invoke(main, ["--help"])
+        result = runner.invoke(main, ["--help"], catch_exceptions=False)
         assert result.exit_code == 0
         assert "Launch Claude Code" in result.output
         assert "--github" in result.output
@@ -115,264 +146,131 @@ class TestClickCli:
 
     def test_help_short_option(self, runner):
         """-h shows usage information."""
-        result = runner.invoke(main, ["-h"])
+        result = runner.invoke(main, ["-h"], catch_exceptions=False)
         assert result.exit_code == 0
         assert "Launch Claude Code" in result.output
 
 
-class TestFunctionalBasicFlow:
-    """Test basic sandbox launch flow."""
-
-    @pytest.fixture
-    def mock_all_externals(self, mocker):
-        """Mock all external system calls for functional tests."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=False)
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.get_macos_audio_devices", return_value=(None, None))
-        mocker.patch("claude_sandbox.cli.get_script_dir", return_value="/tmp/test")
-        mocker.patch("os.environ.get", side_effect=lambda k, d="": {
-            "ANTHROPIC_API_KEY": "test-api-key",
-            "TERM": "xterm-256color",
-        }.get(k, d))
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-        return mock_run
-
-    def test_default_profile_launches_correctly(self, mock_all_externals, capsys):
-        """Default profile launches with expected Docker arguments."""
-        args = Args()
-        run_sandbox(args)
-
-        mock_all_externals.assert_called_once()
-        cmd = mock_all_externals.call_args[0][0]
-
-        # Verify it's a docker run command
-        assert cmd[0] == "docker"
-        assert cmd[1] == "run"
-        assert "-it" in cmd
-
-        # Verify default profile names
-        assert any("claude-sandbox-default:/home/claude" in arg for arg in cmd)
-        assert any("claude-sandbox-default-workspace:/workspace" in arg for arg in cmd)
-
-        # Verify image name and /bin/bash at end
-        assert "claude-sandbox" in cmd
-        assert cmd[-1] == "/bin/bash"
-
-    def test_custom_profile_uses_profile_name(self, mock_all_externals, mocker):
-        """Custom profile name is used in volume and container names."""
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-
-        args = Args(profile="myproject")
+class TestFunctionalLaunch:
+    """Test the docker command built for each combination of options."""
+
+    @pytest.mark.parametrize(
+        ("args", "expected_present", "expected_absent", "expected_tail"),
+        [
+            pytest.param(
+                _DEFAULT_ARGS,
+                ["-it", "claude-sandbox-default:/home/claude",
+                 "claude-sandbox-default-workspace:/workspace",
+                 "ANTHROPIC_API_KEY=test-api-key", "TERM=xterm-256color"],
+                ["-d", "sleep", _SSH_AUTH_SOCK_ENV],
+                _INTERACTIVE_TAIL,
+                id="default-profile",
+            ),
+            pytest.param(
+                replace(_DEFAULT_ARGS, profile="myproject"),
+                ["claude-sandbox-myproject:/home/claude",
+                 "claude-sandbox-myproject-workspace:/workspace"],
+                ["claude-sandbox-default:/home/claude"],
+                _INTERACTIVE_TAIL,
+                id="custom-profile",
+            ),
+            pytest.param(
+                replace(_DEFAULT_ARGS, enable_github=True),
+                [_SSH_AUTH_SOCK_ENV, "GIT_AUTHOR_NAME=Test User",
+                 "GIT_AUTHOR_EMAIL=test@example.com", "GIT_COMMITTER_NAME=Test User",
+                 "GIT_COMMITTER_EMAIL=test@example.com"],
+                [],
+                _INTERACTIVE_TAIL,
+                id="github",
+            ),
+            pytest.param(
+                replace(_DEFAULT_ARGS, detach_mode=True),
+                ["-d"],
+                ["-it", "/bin/bash"],
+                _DETACHED_TAIL,
+                id="detached",
+            ),
+            pytest.param(
+                replace(_DEFAULT_ARGS, host_ports=(8080, 3000)),
+                ["HOST_PORTS=8080 3000"],
+                [],
+                _INTERACTIVE_TAIL,
+                id="host-ports",
+            ),
+            pytest.param(
+                replace(_DEFAULT_ARGS, profile="myproject", enable_github=True,
+                        detach_mode=True, host_ports=(8080, 3000)),
+                ["-d", "GIT_AUTHOR_NAME=Test User",
+                 "claude-sandbox-myproject:/home/claude", "HOST_PORTS=8080 3000"],
+                ["-it"],
+                _DETACHED_TAIL,
+                id="all-options",
+            ),
+        ],
+    )
+    def test_docker_command(self, args, expected_present, expected_absent, expected_tail):
+        """The docker run command reflects the selected options."""
+        github_config = _GIT_CONFIG if args.enable_github else None
+        cmd = build_docker_cmd(args, github_config, _ENV)
+        cmd_set = set(cmd)
+
+        assert cmd[:2] == ["docker", "run"]
+        assert args.container_name in cmd_set  # hostname/name
+        # Flags and -e/-v values can sit anywhere among the docker options
+        assert cmd_set.issuperset(expected_present)
+        assert cmd_set.isdisjoint(expected_absent)
+        # The image and the container's command must come after every docker option
+        assert cmd[-len(expected_tail):] == expected_tail
+
+
+class TestFunctionalRunSandbox:
+    """Test that run_sandbox launches the command build_docker_cmd describes."""
+
+    def test_interactive_execs_docker(self, mock_cli_externals):
+        """Interactive mode replaces the process with docker run -it."""
+        args = replace(_DEFAULT_ARGS, host_ports=(8080,))
         run_sandbox(args)
 
-        cmd = mock_all_externals.call_args[0][0]
-        assert any("claude-sandbox-myproject:/home/claude" in arg for arg in cmd)
-        assert any("claude-sandbox-myproject-workspace:/workspace" in arg for arg in cmd)
-        assert any(arg == "claude-sandbox-myproject" for arg in cmd)  # hostname/name
-
-
-class TestFunctionalWithGitHub:
-    """Test GitHub-enabled flow."""
-
-    @pytest.fixture
-    def mock_github_externals(self, mocker):
-        """Mock externals with GitHub enabled."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=False)
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.get_macos_audio_devices", return_value=(None, None))
-        mocker.patch("claude_sandbox.cli.get_script_dir", return_value="/tmp/test")
-        mocker.patch("claude_sandbox.cli.get_git_config", return_value={
-            "user_name": "Test User",
-            "user_email": "test@example.com",
-        })
-        mocker.patch("claude_sandbox.cli.validate_github_requirements", return_value=(True, []))
-        mocker.patch("os.environ.get", side_effect=lambda k, d="": {
-            "ANTHROPIC_API_KEY": "test-api-key",
-            "TERM": "xterm-256color",
-            "SSH_AUTH_SOCK": "/tmp/ssh.sock",
-        }.get(k, d))
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-        return mock_run
-
-    def test_github_flag_adds_ssh_and_git_config(self, mock_github_externals):
-        """--github flag adds SSH socket and git config to Docker args."""
-        args = Args(enable_github=True)
-        run_sandbox(args)
+        expected = build_docker_cmd(args, None, os.environ)
+        mock_cli_externals["execvp"].assert_called_once_with("docker", expected)
 
-        cmd = mock_github_externals.call_args[0][0]
-
-        # Check SSH socket mount
-        assert any("ssh-auth.sock" in arg for arg in cmd)
-
-        # Check git environment variables
-        assert any("GIT_AUTHOR_NAME=Test User" in arg for arg in cmd)
-        assert any("GIT_AUTHOR_EMAIL=test@example.com" in arg for arg in cmd)
-        assert any("GIT_COMMITTER_NAME=Test User" in arg for arg in cmd)
-        assert any("GIT_COMMITTER_EMAIL=test@example.com" in arg for arg in cmd)
-
-
-class TestFunctionalDetachedMode:
-    """Test detached mode flow."""
-
-    @pytest.fixture
-    def mock_detach_externals(self, mocker):
-        """Mock externals for detached mode."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=False)
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.get_macos_audio_devices", return_value=(None, None))
-        mocker.patch("claude_sandbox.cli.get_script_dir", return_value="/tmp/test")
-        mocker.patch("os.environ.get", side_effect=lambda k, d="": {
-            "ANTHROPIC_API_KEY": "test-api-key",
-            "TERM": "xterm-256color",
-        }.get(k, d))
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-        mocker.patch("builtins.print")
-        return mock_run
-
-    def test_detach_mode_uses_d_flag(self, mock_detach_externals):
-        """Detached mode uses -d flag instead of -it."""
-        args = Args(detach_mode=True)
+    def test_detached_runs_docker(self, mock_cli_externals):
+        """Detached mode runs docker run -d and waits for it."""
+        args = replace(_DEFAULT_ARGS, detach_mode=True)
         run_sandbox(args)
 
-        cmd = mock_detach_externals.call_args[0][0]
-        assert "-d" in cmd
-        assert "-it" not in cmd
-
-    def test_detach_mode_runs_sleep_infinity(self, mock_detach_externals):
-        """Detached mode runs 'sleep infinity' as command."""
-        args = Args(detach_mode=True)
-        run_sandbox(args)
+        mock_cli_externals["run"].assert_called_once_with(
+            build_docker_cmd(args, None, os.environ), capture_output=True, check=False
+        )
 
-        cmd = mock_detach_externals.call_args[0][0]
-        assert "sleep" in cmd
-        assert "infinity" in cmd
-
-
-class TestFunctionalHostPorts:
-    """Test host port access flow."""
-
-    @pytest.fixture
-    def mock_port_externals(self, mocker):
-        """Mock externals for port testing."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=False)
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.get_macos_audio_devices", return_value=(None, None))
-        mocker.patch("claude_sandbox.cli.get_script_dir", return_value="/tmp/test")
-        mocker.patch("os.environ.get", side_effect=lambda k, d="": {
-            "ANTHROPIC_API_KEY": "test-api-key",
-            "TERM": "xterm-256color",
-        }.get(k, d))
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-        return mock_run
-
-    def test_host_ports_passed_to_container(self, mock_port_externals):
-        """Host ports are passed as environment variable."""
-        args = Args(host_ports=[8080, 3000])
+    def test_github_passes_git_config(self, mock_github_externals):
+        """--github forwards the host git config into the command."""
+        args = replace(_DEFAULT_ARGS, enable_github=True)
         run_sandbox(args)
 
-        cmd = mock_port_externals.call_args[0][0]
-        # Find HOST_PORTS env var
-        host_ports_found = False
-        for i, arg in enumerate(cmd):
-            if arg == "-e" and i + 1 < len(cmd) and cmd[i + 1].startswith("HOST_PORTS="):
-                host_ports_found = True
-                assert "8080" in cmd[i + 1]
-                assert "3000" in cmd[i + 1]
-                break
-        assert host_ports_found
+        git_config = mock_github_externals["get_git_config"].return_value
+        expected = build_docker_cmd(args, git_config, os.environ)
+        mock_github_externals["execvp"].assert_called_once_with("docker", expected)
 
 
 class TestFunctionalErrorCases:
     """Test error handling in functional scenarios."""
 
-    def test_exits_on_pulseaudio_failure(self, mocker):
+    def test_exits_on_pulseaudio_failure(self, mock_cli_externals):
         """Exits with code 1 when PulseAudio fails."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=False)
-        mocker.patch("claude_sandbox.cli.start_pulseaudio", return_value=False)
-        mocker.patch("builtins.print")
+        mock_cli_externals["check_pulseaudio_running"].return_value = False
+        mock_cli_externals["start_pulseaudio"].return_value = False
 
         with pytest.raises(SystemExit) as exc_info:
-            run_sandbox(Args())
+            run_sandbox(_DEFAULT_ARGS)
 
         assert exc_info.value.code == 1
 
-    def test_exits_on_container_conflict(self, mocker):
+    def test_exits_on_container_conflict(self, mock_cli_externals):
         """Exits with code 1 when container already exists."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=True)
-        mocker.patch("builtins.print")
+        mock_cli_externals["check_container_exists"].return_value = True
 
         with pytest.raises(SystemExit) as exc_info:
-            run_sandbox(Args())
+            run_sandbox(_DEFAULT_ARGS)
 
         assert exc_info.value.code == 1
-
-
-class TestFunctionalCombinedOptions:
-    """Test combinations of options."""
-
-    @pytest.fixture
-    def mock_combined_externals(self, mocker):
-        """Mock externals for combined option testing."""
-        mocker.patch("claude_sandbox.cli.check_pulseaudio_running", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_image_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.check_container_exists", return_value=False)
-        mocker.patch("claude_sandbox.cli.ensure_volume_exists", return_value=True)
-        mocker.patch("claude_sandbox.cli.get_macos_audio_devices", return_value=(None, None))
-        mocker.patch("claude_sandbox.cli.get_script_dir", return_value="/tmp/test")
-        mocker.patch("claude_sandbox.cli.get_git_config", return_value={
-            "user_name": "Test User",
-            "user_email": "test@example.com",
-        })
-        mocker.patch("claude_sandbox.cli.validate_github_requirements", return_value=(True, []))
-        mocker.patch("os.environ.get", side_effect=lambda k, d="": {
-            "ANTHROPIC_API_KEY": "test-api-key",
-            "TERM": "xterm-256color",
-            "SSH_AUTH_SOCK": "/tmp/ssh.sock",
-        }.get(k, d))
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
-        mocker.patch("builtins.print")
-        return mock_run
-
-    def test_all_options_combined(self, mock_combined_externals):
-        """All options work together correctly."""
-        args = Args(
-            profile="myproject",
-            enable_github=True,
-            detach_mode=True,
-            host_ports=[8080, 3000],
-        )
-        run_sandbox(args)
-
-        cmd = mock_combined_externals.call_args[0][0]
-
-        # Detached mode
-        assert "-d" in cmd
-        assert "-it" not in cmd
-
-        # GitHub
-        assert any("GIT_AUTHOR_NAME=Test User" in arg for arg in cmd)
-
-        # Profile
-        assert any("claude-sandbox-myproject:/home/claude" in arg for arg in cmd)
-
-        # Host ports
-        assert any("HOST_PORTS=" in arg and "8080" in arg for arg in cmd)
-
-        # Sleep infinity for detached
-        assert "sleep" in cmd
-        assert "infinity" in cmd
@@ -3,6 +3,8 @@
 import os
 import subprocess
 
+import pytest
+
 from claude_sandbox.system import (
     check_pulseaudio_running,
     get_git_config,
@@ -12,91 +14,111 @@ from claude_sandbox.system import (
     validate_github_requirements,
 )
 
+_SSH_ENV = {"SSH_AUTH_SOCK": "/tmp/ssh.sock"}
+
+# SwitchAudioSource -c output
+_CURRENT_OUTPUT = b"MacBook Pro Speakers\n"
+_CURRENT_INPUT = b"MacBook Pro Microphone\n"
+
+# pactl -f json list sinks/sources output
+_SINK_LIST = b'[{"name": "output.speaker", "description": "MacBook Pro Speakers"}]'
+_SOURCE_LIST = b'[{"name": "input.mic", "description": "MacBook Pro Microphone"}]'
+_OTHER_DEVICE_LIST = b'[{"name": "other.device", "description": "Other Device"}]'
+_SOURCE_LIST_WITH_MONITOR = (
+    b'[{"name": "output.speaker.monitor", "description": "MacBook Pro Microphone"},'
+    b' {"name": "input.mic", "description": "MacBook Pro Microphone"}]'
+)
+
+# pactl list sources output, for pactl builds without JSON support
+_SOURCE_LIST_TEXT = (
+    b"Name: output.speaker.monitor\n\tDescription: MacBook Pro Microphone\n"
+    b"Name: input.mic\n\tDescription: MacBook Pro Microphone\n"
+)
+_SOURCE_LIST_TEXT_EMPTY_DESCRIPTION = (
+    b"Name: input.unnamed\n\tDescription: \n"
+    b"Name: input.mic\n\tDescription: MacBook Pro Microphone\n"
+)
+
 
 class TestCheckPulseaudioRunning:
     """Test PulseAudio status checks."""
 
-    def test_returns_true_when_running(self, mocker):
-        """Returns True when PulseAudio is running."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
+    def test_returns_true_when_tcp_port_accepts(self, mocker, fake_subprocess):
+        """Returns True without running pulseaudio when the TCP port answers."""
+        mock_connect = mocker.patch("socket.create_connection")
 
         result = check_pulseaudio_running()
 
         assert result is True
-        mock_run.assert_called_once_with(
+        mock_connect.assert_called_once_with(("127.0.0.1", 4713), timeout=0.1)
+        fake_subprocess.run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("returncode", "expected"),
+        [pytest.param(0, True, id="running"), pytest.param(1, False, id="not-running")],
+    )
+    def test_falls_back_to_pulseaudio_check(self, mocker, fake_subprocess, returncode, expected):
+        """Falls back to pulseaudio --check when the TCP port doesn't answer."""
+        mocker.patch("socket.create_connection", side_effect=ConnectionRefusedError)
+        fake_subprocess.queue(returncode)
+
+        result = check_pulseaudio_running()
+
+        assert result is expected
+        fake_subprocess.run.assert_called_once_with(
             ["pulseaudio", "--check"],
             capture_output=True,
             check=False,
         )
 
-    def test_returns_false_when_not_running(self, mocker):
-        """Returns False when PulseAudio is not running."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 1)
-
-        result = check_pulseaudio_running()
-
-        assert result is False
-
 
 class TestStartPulseaudio:
     """Test PulseAudio startup."""
 
-    def test_starts_successfully(self, mocker):
-        """Returns True when PulseAudio starts successfully."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 0)
+    @pytest.mark.parametrize(
+        ("returncode", "expected"),
+        [pytest.param(0, True, id="started"), pytest.param(1, False, id="failed")],
+    )
+    def test_start_pulseaudio(self, fake_subprocess, returncode, expected):
+        """Reports whether the PulseAudio daemon started."""
+        fake_subprocess.queue(returncode)
 
         result = start_pulseaudio()
 
-        assert result is True
-        mock_run.assert_called_once_with(
+        assert result is expected
+        fake_subprocess.run.assert_called_once_with(
             ["pulseaudio", "--exit-idle-time=-1", "--daemon"],
             capture_output=True,
             check=False,
         )
 
-    def test_returns_false_on_failure(self, mocker):
-        """Returns False when PulseAudio fails to start."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 1)
-
-        result = start_pulseaudio()
-
-        assert result is False
-
 
 class TestGetMacosAudioDevices:
     """Test macOS audio device detection."""
 
-    def test_returns_devices_when_available(self, mocker):
+    def test_returns_devices_when_available(self, fake_subprocess):
         """Returns output and input device names."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = [
-            subprocess.CompletedProcess([], 0, stdout=b"MacBook Pro Speakers\n"),
-            subprocess.CompletedProcess([], 0, stdout=b"MacBook Pro Microphone\n"),
-        ]
+        fake_subprocess.queue(0, stdout=_CURRENT_OUTPUT)
+        fake_subprocess.queue(0, stdout=_CURRENT_INPUT)
 
         output, input_dev = get_macos_audio_devices()
 
         assert output == "MacBook Pro Speakers"
         assert input_dev == "MacBook Pro Microphone"
 
-    def test_returns_none_when_command_not_found(self, mocker):
+    def test_returns_none_when_command_not_found(self, fake_subprocess):
         """Returns None when SwitchAudioSource is not available."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = FileNotFoundError()
+        fake_subprocess.run.side_effect = FileNotFoundError()
 
         output, input_dev = get_macos_audio_devices()
 
         assert output is None
         assert input_dev is None
 
-    def test_returns_none_on_command_failure(self, mocker):
+    def test_returns_none_on_command_failure(self, fake_subprocess):
         """Returns None when command fails."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess([], 1, stdout=b"")
+        fake_subprocess.queue(1)
+        fake_subprocess.queue(1)
 
         output, input_dev = get_macos_audio_devices()
 
@@ -107,60 +129,102 @@ class TestGetMacosAudioDevices:
 class TestSyncPulseaudioDefaults:
     """Test PulseAudio default device sync."""
 
-    def test_sets_defaults_when_devices_found(self, mocker):
+    def test_sets_defaults_when_devices_found(self, fake_subprocess):
         """Sets PulseAudio defaults when matching devices found."""
-        mock_run = mocker.patch("subprocess.run")
-        # pactl list sinks output
-        mock_run.side_effect = [
-            subprocess.CompletedProcess(
-                [], 0,
-                stdout=b"Name: output.speaker\n\tDescription: MacBook Pro Speakers\n"
-            ),
-            subprocess.CompletedProcess([], 0),  # set-default-sink
-            subprocess.CompletedProcess(
-                [], 0,
-                stdout=b"Name: input.mic\n\tDescription: MacBook Pro Microphone\n"
-            ),
-            subprocess.CompletedProcess([], 0),  # set-default-source
-        ]
+        fake_subprocess.queue(0, stdout=_SINK_LIST)
+        fake_subprocess.queue(0)  # set-default-sink
+        fake_subprocess.queue(0, stdout=_SOURCE_LIST)
+        fake_subprocess.queue(0)  # set-default-source
 
         sink, source = sync_pulseaudio_defaults("MacBook Pro Speakers", "MacBook Pro Microphone")
 
         assert sink == "output.speaker"
         assert source == "input.mic"
+        fake_subprocess.run.assert_any_call(
+            ["pactl", "-f", "json", "list", "sinks"],
+            capture_output=True,
+            check=False,
+        )
+        fake_subprocess.run.assert_any_call(
+            ["pactl", "set-default-sink", "output.speaker"],
+            capture_output=True,
+            check=False,
+        )
 
-    def test_returns_none_when_no_match(self, mocker):
+    def test_returns_none_when_no_match(self, fake_subprocess):
         """Returns None when no matching device found."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = subprocess.CompletedProcess(
-            [], 0, stdout=b"Name: other.device\n\tDescription: Other Device\n"
-        )
+        fake_subprocess.queue(0, stdout=_OTHER_DEVICE_LIST)  # sinks
+        fake_subprocess.queue(0, stdout=_OTHER_DEVICE_LIST)  # sources
 
         sink, source = sync_pulseaudio_defaults("MacBook Pro Speakers", "MacBook Pro Microphone")
 
         assert sink is None
         assert source is None
 
+    def test_skips_monitor_sources(self, fake_subprocess):
+        """Skips .monitor sources that share a description with the real input."""
+        fake_subprocess.queue(0, stdout=_SOURCE_LIST_WITH_MONITOR)
+        fake_subprocess.queue(0)  # set-default-source
+
+        sink, source = sync_pulseaudio_defaults(None, "MacBook Pro Microphone")
+
+        assert sink is None
+        assert source == "input.mic"
+
+    def test_falls_back_to_text_output(self, fake_subprocess):
+        """Parses the text format when pactl has no JSON output."""
+        fake_subprocess.queue(1)  # pactl -f json unsupported
+        fake_subprocess.queue(0, stdout=_SOURCE_LIST_TEXT)
+        fake_subprocess.queue(0)  # set-default-source
+
+        sink, source = sync_pulseaudio_defaults(None, "MacBook Pro Microphone")
+
+        assert sink is None
+        assert source == "input.mic"
+        fake_subprocess.run.assert_any_call(
+            ["pactl", "list", "sources"],
+            capture_output=True,
+            check=False,
+        )
+
+
+    def test_text_output_empty_description(self, fake_subprocess):
+        """An empty Description line doesn't swallow the next device's Name line."""
+        fake_subprocess.queue(1)  # pactl -f json unsupported
+        fake_subprocess.queue(0, stdout=_SOURCE_LIST_TEXT_EMPTY_DESCRIPTION)
+        fake_subprocess.queue(0)  # set-default-source
+
+        sink, source = sync_pulseaudio_defaults(None, "MacBook Pro Microphone")
+
+        assert sink is None
+        assert source == "input.mic"
+
 
 class TestGetGitConfig:
     """Test git config retrieval."""
 
-    def test_returns_config_values(self, mocker):
+    def test_returns_config_values(self, cached_git_config):
         """Returns git user name and email."""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = [
-            subprocess.CompletedProcess([], 0, stdout=b"Test User\n"),
-            subprocess.CompletedProcess([], 0, stdout=b"test@example.com\n"),
-        ]
+        assert cached_git_config == {
+            "user_name": "Test User",
+            "user_email": "test@example.com",
+        }
+
+    def test_returns_none_for_unset_key(self, mocker):
+        """Returns None for a key that isn't set when the other one is."""
+        mock_run = mocker.patch.object(subprocess, "run")
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 0, stdout=b"user.name Test User\n"
+        )
 
         config = get_git_config()
 
         assert config["user_name"] == "Test User"
-        assert config["user_email"] == "test@example.com"
+        assert config["user_email"] is None
 
     def test_returns_none_for_missing_config(self, mocker):
         """Returns None for missing config values."""
-        mock_run = mocker.patch("subprocess.run")
+        mock_run = mocker.patch.object(subprocess, "run")
         mock_run.return_value = subprocess.CompletedProcess([], 1, stdout=b"")
 
         config = get_git_config()
@@ -172,45 +236,38 @@ class TestGetGitConfig:
 class TestValidateGithubRequirements:
     """Test GitHub access requirements validation."""
 
-    def test_valid_when_all_present(self, mocker):
+    def test_valid_when_all_present(self, cached_git_config):
         """Returns success when all requirements met."""
-        mocker.patch.dict(os.environ, {"SSH_AUTH_SOCK": "/tmp/ssh-agent.sock"})
-        git_config = {"user_name": "Test User", "user_email": "test@example.com"}
-
-        valid, errors = validate_github_requirements(git_config)
+        valid, errors = validate_github_requirements(cached_git_config, _SSH_ENV)
 
         assert valid is True
         assert errors == []
 
-    def test_invalid_when_no_ssh_agent(self, mocker):
+    def test_invalid_when_no_ssh_agent(self, mocker, cached_git_config):
         """Returns error when SSH agent not running."""
+        # clear=True empties the environment and restores it afterwards, so
+        # SSH_AUTH_SOCK is already gone; this also covers the os.environ default
         mocker.patch.dict(os.environ, {}, clear=True)
-        # Make sure SSH_AUTH_SOCK is not in env
-        if "SSH_AUTH_SOCK" in os.environ:
-            del os.environ["SSH_AUTH_SOCK"]
-        git_config = {"user_name": "Test User", "user_email": "test@example.com"}
 
-        valid, errors = validate_github_requirements(git_config)
+        valid, errors = validate_github_requirements(cached_git_config)
 
         assert valid is False
         assert any("SSH" in err for err in errors)
 
-    def test_invalid_when_missing_git_name(self, mocker):
+    def test_invalid_when_missing_git_name(self, cached_git_config):
         """Returns error when git user.name not set."""
-        mocker.patch.dict(os.environ, {"SSH_AUTH_SOCK": "/tmp/ssh.sock"})
-        git_config = {"user_name": None, "user_email": "test@example.com"}
+        git_config = {**cached_git_config, "user_name": None}
 
-        valid, errors = validate_github_requirements(git_config)
+        valid, errors = validate_github_requirements(git_config, _SSH_ENV)
 
         assert valid is False
         assert any("user.name" in err for err in errors)
 
-    def test_invalid_when_missing_git_email(self, mocker):
+    def test_invalid_when_missing_git_email(self, cached_git_config):
         """Returns error when git user.email not set."""
-        mocker.patch.dict(os.environ, {"SSH_AUTH_SOCK": "/tmp/ssh.sock"})
-        git_config = {"user_name": "Test User", "user_email": None}
+        git_config = {**cached_git_config, "user_email": None}
 
-        valid, errors = validate_github_requirements(git_config)
+        valid, errors = validate_github_requirements(git_config, _SSH_ENV)
 
         assert valid is False
         assert any("user.email" in err for err in errors)